@@ -1,683 +1,1127 @@
-#!/usr/bin/env python3
-"""
-News Aggregator Tool
-====================
-
-A news aggregation script that fetches articles from multiple APIs
-and pushes them to a Notion database with automatic cleanup.
-
-Version: 2.1.0
-Python: 3.11+
-"""
-
-import requests
-from notion_client import Client
-from datetime import datetime, timezone, timedelta
-import time
-import logging
-from typing import List, Dict, Set, Optional, Tuple
-from dataclasses import dataclass
-from urllib.parse import urlparse
-import sys
-import os
-
-# Configuration
-NOTION_TOKEN = os.getenv('NOTION_TOKEN', "ntn_v50193920684b9M32Pr8lVSz4BH97YIePN01WdXO0TS39A")
-DATABASE_ID = os.getenv('DATABASE_ID', "26612b2dd84480c9ae0cd716d42c4944")  
-GNEWS_API_KEY = os.getenv('GNEWS_API_KEY', "e6ab131a38240a286eeb29bd2704d7cc")
-MEDIASTACK_API_KEY = os.getenv('MEDIASTACK_API_KEY', "611bb902ac4ab791ac8e2e504b5586f2")
-CURRENTS_API_KEY = os.getenv('CURRENTS_API_KEY', "c4TwqKy9N7Yx6iMg-orThtFtqPSz6U6pX3ttnsVVVmf4Szg4")
-
-# Settings
-REQUEST_TIMEOUT = 30
-RATE_LIMIT_DELAY = 0.1
-MAX_ARTICLES_PER_API = 50
-ARTICLE_RETENTION_DAYS = 3
-ENABLE_AUTO_DELETE = True
-
-# Database field names
-NOTION_PROPERTIES = {
-    'headline': 'Headline',
-    'source': 'Source',
-    'url': 'URL',
-    'category': 'Category',
-    'published_at': 'Published At',
-    'added_at': 'Added At'
-}
-
-def setup_logging() -> logging.Logger:
-    """Setup basic logging."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    logger = logging.getLogger(__name__)
-    return logger
-
-@dataclass
-class NewsArticle:
-    """Represents a news article."""
-    title: str
-    source: str
-    url: str
-    category: str = "General"
-    published_at: Optional[str] = None
-    
-    def __post_init__(self):
-        """Clean up article data."""
-        self.title = self.title.strip() if self.title else "No Title"
-        self.source = self.source.strip() if self.source else "Unknown"
-        self.url = self.url.strip() if self.url else ""
-        self.category = self.category.strip() if self.category else "General"
-        
-        if not self.published_at:
-            self.published_at = datetime.now(timezone.utc).isoformat()
-    
-    @property
-    def is_valid(self) -> bool:
-        """Check if article has required data."""
-        return (
-            self.title and 
-            self.title != "No Title" and
-            self.url and
-            self._is_valid_url(self.url)
-        )
-    
-    def _is_valid_url(self, url: str) -> bool:
-        """Check if URL is properly formatted."""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except Exception:
-            return False
-
-class NotionManager:
-    """Handles Notion database operations."""
-    
-    def __init__(self, token: str, database_id: str, logger: logging.Logger):
-        self.client = Client(auth=token)
-        self.database_id = database_id
-        self.logger = logger
-        self._existing_titles: Optional[Set[str]] = None
-    
-    def setup_database(self) -> bool:
-        """Make sure database has all needed properties."""
-        try:
-            required_properties = {
-                NOTION_PROPERTIES['source']: {
-                    "select": {
-                        "options": [
-                            {"name": "GNews", "color": "blue"},
-                            {"name": "MediaStack", "color": "green"}, 
-                            {"name": "Currents", "color": "orange"},
-                            {"name": "Manual", "color": "gray"},
-                            {"name": "Unknown", "color": "default"}
-                        ]
-                    }
-                },
-                NOTION_PROPERTIES['url']: {"url": {}},
-                NOTION_PROPERTIES['category']: {
-                    "select": {
-                        "options": [
-                            {"name": "General", "color": "default"},
-                            {"name": "Sports", "color": "green"},
-                            {"name": "Politics", "color": "red"},
-                            {"name": "Business", "color": "blue"},
-                            {"name": "Technology", "color": "purple"},
-                            {"name": "Entertainment", "color": "pink"},
-                            {"name": "Health", "color": "yellow"}
-                        ]
-                    }
-                },
-                NOTION_PROPERTIES['published_at']: {"date": {}},
-                NOTION_PROPERTIES['added_at']: {"date": {}}
-            }
-            
-            database = self.client.databases.retrieve(self.database_id)
-            current_properties = database["properties"]
-            
-            missing_properties = {}
-            for prop_name, prop_schema in required_properties.items():
-                if prop_name not in current_properties:
-                    missing_properties[prop_name] = prop_schema
-            
-            if missing_properties:
-                self.client.databases.update(
-                    self.database_id,
-                    properties=missing_properties
-                )
-                self.logger.info(f"Added missing properties: {', '.join(missing_properties.keys())}")
-            else:
-                self.logger.info("All required properties exist")
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to setup database properties: {e}")
-            return False
-    
-    def get_existing_headlines(self) -> Set[str]:
-        """Get all existing headlines to avoid duplicates."""
-        if self._existing_titles is not None:
-            return self._existing_titles
-        
-        existing_titles = set()
-        
-        try:
-            has_more = True
-            start_cursor = None
-            
-            while has_more:
-                query_params = {"database_id": self.database_id}
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-                
-                response = self.client.databases.query(**query_params)
-                
-                for page in response.get("results", []):
-                    title_data = page.get("properties", {}).get(
-                        NOTION_PROPERTIES['headline'], {}
-                    ).get("title", [])
-                    
-                    if title_data:
-                        title = title_data[0]["text"]["content"].strip()
-                        if title:
-                            existing_titles.add(title)
-                
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
-            
-            self._existing_titles = existing_titles
-            self.logger.info(f"Found {len(existing_titles)} existing headlines")
-            return existing_titles
-            
-        except Exception as e:
-            self.logger.error(f"Error fetching existing headlines: {e}")
-            return set()
-    
-    def cleanup_old_articles(self, retention_days: int = ARTICLE_RETENTION_DAYS) -> int:
-        """Remove articles older than specified days."""
-        if not ENABLE_AUTO_DELETE:
-            self.logger.info("Auto-delete is disabled")
-            return 0
-        
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
-        deleted_count = 0
-        
-        self.logger.info(f"Cleaning up articles older than {retention_days} days...")
-        self.logger.info(f"Cutoff date: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')} UTC")
-        
-        try:
-            filter_condition = {
-                "property": NOTION_PROPERTIES['added_at'],
-                "date": {
-                    "before": cutoff_date.isoformat()
-                }
-            }
-            
-            has_more = True
-            start_cursor = None
-            
-            while has_more:
-                query_params = {
-                    "database_id": self.database_id,
-                    "filter": filter_condition
-                }
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-                
-                response = self.client.databases.query(**query_params)
-                pages_to_delete = response.get("results", [])
-                
-                for page in pages_to_delete:
-                    try:
-                        page_id = page["id"]
-                        
-                        # Get article info for logging
-                        title_data = page.get("properties", {}).get(
-                            NOTION_PROPERTIES['headline'], {}
-                        ).get("title", [])
-                        title = "Unknown Title"
-                        if title_data:
-                            title = title_data[0]["text"]["content"][:50]
-                        
-                        added_date_data = page.get("properties", {}).get(
-                            NOTION_PROPERTIES['added_at'], {}
-                        ).get("date", {})
-                        added_date = "Unknown Date"
-                        if added_date_data and added_date_data.get("start"):
-                            added_date = added_date_data["start"][:10]
-                        
-                        # Archive the page
-                        self.client.pages.update(page_id=page_id, archived=True)
-                        deleted_count += 1
-                        
-                        self.logger.info(f"Deleted: '{title}' (added: {added_date})")
-                        time.sleep(RATE_LIMIT_DELAY)
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error deleting page {page.get('id', 'unknown')}: {e}")
-                        continue
-                
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
-            
-            self.logger.info(f"Cleanup completed. Deleted {deleted_count} old articles")
-            return deleted_count
-            
-        except Exception as e:
-            self.logger.error(f"Error during cleanup: {e}")
-            return deleted_count
-    
-    def get_database_stats(self) -> Dict[str, int]:
-        """Get database statistics."""
-        try:
-            total_articles = 0
-            has_more = True
-            start_cursor = None
-            
-            while has_more:
-                query_params = {"database_id": self.database_id}
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-                
-                response = self.client.databases.query(**query_params)
-                total_articles += len(response.get("results", []))
-                
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
-            
-            # Count recent articles
-            yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-            recent_filter = {
-                "property": NOTION_PROPERTIES['added_at'],
-                "date": {
-                    "after": yesterday.isoformat()
-                }
-            }
-            
-            recent_response = self.client.databases.query(
-                database_id=self.database_id,
-                filter=recent_filter
-            )
-            recent_articles = len(recent_response.get("results", []))
-            
-            return {
-                "total_articles": total_articles,
-                "recent_articles": recent_articles
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error getting database stats: {e}")
-            return {"total_articles": 0, "recent_articles": 0}
-    
-    def add_articles(self, articles: List[NewsArticle]) -> Tuple[int, int, int]:
-        """Add articles to database."""
-        if not articles:
-            self.logger.warning("No articles to add")
-            return 0, 0, 0
-        
-        existing_headlines = self.get_existing_headlines()
-        added_count = skipped_count = error_count = 0
-        
-        for article in articles:
-            try:
-                # Skip invalid articles
-                if not article.is_valid:
-                    self.logger.warning(f"Skipped invalid article: {article.title}")
-                    skipped_count += 1
-                    continue
-                
-                # Skip duplicates
-                if article.title in existing_headlines:
-                    self.logger.info(f"Skipped duplicate: {article.title}")
-                    skipped_count += 1
-                    continue
-                
-                # Add to Notion
-                self._create_page(article)
-                self.logger.info(f"Added: {article.title}")
-                added_count += 1
-                
-                existing_headlines.add(article.title)
-                time.sleep(RATE_LIMIT_DELAY)
-                
-            except Exception as e:
-                self.logger.error(f"Error adding article '{article.title}': {e}")
-                error_count += 1
-                continue
-        
-        return added_count, skipped_count, error_count
-    
-    def _create_page(self, article: NewsArticle) -> None:
-        """Create new page in database."""
-        current_time = datetime.now(timezone.utc).isoformat()
-        
-        safe_source = self._validate_option(article.source, "source")
-        safe_category = self._validate_option(article.category, "category")
-        
-        properties = {
-            NOTION_PROPERTIES['headline']: {
-                "title": [{"text": {"content": article.title}}]
-            },
-            NOTION_PROPERTIES['source']: {
-                "select": {"name": safe_source}
-            },
-            NOTION_PROPERTIES['url']: {
-                "url": article.url
-            },
-            NOTION_PROPERTIES['category']: {
-                "select": {"name": safe_category}
-            },
-            NOTION_PROPERTIES['published_at']: {
-                "date": {"start": article.published_at}
-            },
-            NOTION_PROPERTIES['added_at']: {
-                "date": {"start": current_time}
-            }
-        }
-        
-        self.client.pages.create(
-            parent={"database_id": self.database_id},
-            properties=properties
-        )
-    
-    def _validate_option(self, value: str, field_type: str) -> str:
-        """Make sure option exists in select field."""
-        valid_sources = {"GNews", "MediaStack", "Currents", "Manual", "Unknown"}
-        valid_categories = {"General", "Sports", "Politics", "Business", "Technology", "Entertainment", "Health"}
-        
-        if field_type == "source":
-            return value if value in valid_sources else "Unknown"
-        elif field_type == "category":
-            return value if value in valid_categories else "General"
-        else:
-            return value
-
-class NewsAPIClient:
-    """Base class for news API clients."""
-    
-    def __init__(self, logger: logging.Logger):
-        self.logger = logger
-        self.session = requests.Session()
-        self.session.timeout = REQUEST_TIMEOUT
-    
-    def _make_request(self, url: str, api_name: str) -> Optional[Dict]:
-        """Make HTTP request with error handling."""
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.Timeout:
-            self.logger.error(f"{api_name}: Request timeout")
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"{api_name}: Network error - {e}")
-        except Exception as e:
-            self.logger.error(f"{api_name}: Unexpected error - {e}")
-        return None
-
-class GNewsClient(NewsAPIClient):
-    """GNews API client.""" 
-    
-    def __init__(self, api_key: str, logger: logging.Logger):
-        super().__init__(logger)
-        self.api_key = api_key
-    
-    def fetch_articles(self) -> List[NewsArticle]:
-        """Get articles from GNews."""
-        url = f"https://gnews.io/api/v4/top-headlines?country=ng&lang=en&token={self.api_key}&max={MAX_ARTICLES_PER_API}"
-        
-        self.logger.info("Fetching from GNews...")
-        
-        data = self._make_request(url, "GNews")
-        if not data or "articles" not in data:
-            self.logger.warning("GNews: No articles in response")
-            return []
-        
-        articles = []
-        for item in data.get("articles", []):
-            try:
-                article = NewsArticle(
-                    title=item.get("title", "No Title"),
-                    source="GNews",
-                    url=item.get("url", ""),
-                    category="General",
-                    published_at=item.get("publishedAt")
-                )
-                articles.append(article)
-            except Exception as e:
-                self.logger.warning(f"GNews: Error parsing article - {e}")
-                continue
-        
-        self.logger.info(f"GNews: Fetched {len(articles)} articles")
-        return articles
-
-class MediaStackClient(NewsAPIClient):
-    """MediaStack API client."""
-    
-    def __init__(self, api_key: str, logger: logging.Logger):
-        super().__init__(logger)
-        self.api_key = api_key
-    
-    def fetch_articles(self) -> List[NewsArticle]:
-        """Get articles from MediaStack."""
-        url = (f"http://api.mediastack.com/v1/news?"
-               f"access_key={self.api_key}&countries=ng&languages=en"
-               f"&limit={MAX_ARTICLES_PER_API}")
-        
-        self.logger.info("Fetching from MediaStack...")
-        
-        data = self._make_request(url, "MediaStack")
-        if not data or "data" not in data:
-            self.logger.warning("MediaStack: No articles in response")
-            return []
-        
-        articles = []
-        for item in data.get("data", []):
-            try:
-                category = self._map_category(item.get("category", "General"))
-                
-                article = NewsArticle(
-                    title=item.get("title", "No Title"),
-                    source="MediaStack",
-                    url=item.get("url", ""),
-                    category=category,
-                    published_at=item.get("published_at")
-                )
-                articles.append(article)
-            except Exception as e:
-                self.logger.warning(f"MediaStack: Error parsing article - {e}")
-                continue
-        
-        self.logger.info(f"MediaStack: Fetched {len(articles)} articles")
-        return articles
-    
-    def _map_category(self, category: str) -> str:
-        """Map category names."""
-        category_mapping = {
-            "sports": "Sports",
-            "politics": "Politics", 
-            "business": "Business",
-            "technology": "Technology",
-            "tech": "Technology",
-            "entertainment": "Entertainment",
-            "health": "Health"
-        }
-        return category_mapping.get(category.lower(), "General")
-
-class CurrentsClient(NewsAPIClient):
-    """Currents API client."""
-    
-    def __init__(self, api_key: str, logger: logging.Logger):
-        super().__init__(logger)
-        self.api_key = api_key
-    
-    def fetch_articles(self) -> List[NewsArticle]:
-        """Get articles from Currents."""
-        url = (f"https://api.currentsapi.services/v1/latest-news?"
-               f"apiKey={self.api_key}&language=en&region=ng")
-        
-        self.logger.info("Fetching from Currents...")
-        
-        data = self._make_request(url, "Currents")
-        if not data or "news" not in data:
-            self.logger.warning("Currents: No articles in response")
-            return []
-        
-        articles = []
-        for item in data.get("news", []):
-            try:
-                category = self._map_category(item.get("category", "General"))
-                
-                article = NewsArticle(
-                    title=item.get("title", "No Title"),
-                    source="Currents",
-                    url=item.get("url", ""),
-                    category=category,
-                    published_at=item.get("published")
-                )
-                articles.append(article)
-            except Exception as e:
-                self.logger.warning(f"Currents: Error parsing article - {e}")
-                continue
-        
-        self.logger.info(f"Currents: Fetched {len(articles)} articles")
-        return articles
-    
-    def _map_category(self, category: str) -> str:
-        """Map category names."""
-        if not category:
-            return "General"
-        
-        category_mapping = {
-            "sports": "Sports",
-            "politics": "Politics", 
-            "business": "Business",
-            "technology": "Technology",
-            "tech": "Technology",
-            "entertainment": "Entertainment",
-            "health": "Health"
-        }
-        return category_mapping.get(category.lower(), "General")
-
-class NewsAggregator:
-    """Main news aggregation handler."""
-    
-    def __init__(self):
-        self.logger = setup_logging()
-        self.notion_manager = NotionManager(NOTION_TOKEN, DATABASE_ID, self.logger)
-        
-        self.api_clients = [
-            GNewsClient(GNEWS_API_KEY, self.logger),
-            MediaStackClient(MEDIASTACK_API_KEY, self.logger),
-            CurrentsClient(CURRENTS_API_KEY, self.logger)
-        ]
-    
-    def run(self) -> None:
-        """Run the news aggregation process."""
-        self.logger.info("Starting news aggregator...")
-        
-        # Setup database
-        if not self.notion_manager.setup_database():
-            self.logger.error("Failed to setup database. Exiting.")
-            sys.exit(1)
-        
-        # Get initial stats
-        initial_stats = self.notion_manager.get_database_stats()
-        self.logger.info(f"Database contains {initial_stats['total_articles']} total articles")
-        
-        # Clean up old articles
-        deleted_count = self.notion_manager.cleanup_old_articles()
-        
-        # Fetch new articles
-        all_articles = self._fetch_articles()
-        
-        if not all_articles:
-            self.logger.warning("No articles were fetched from any API")
-            return
-        
-        self.logger.info(f"Total articles fetched: {len(all_articles)}")
-        
-        # Add articles to database
-        added, skipped, errors = self.notion_manager.add_articles(all_articles)
-        
-        # Get final stats
-        final_stats = self.notion_manager.get_database_stats()
-        
-        # Show summary
-        self._print_summary(added, skipped, errors, len(all_articles), deleted_count, final_stats)
-        self.logger.info("News aggregation completed!")
-    
-    def _fetch_articles(self) -> List[NewsArticle]:
-        """Fetch articles from all APIs."""
-        all_articles = []
-        
-        for client in self.api_clients:
-            try:
-                articles = client.fetch_articles()
-                all_articles.extend(articles)
-            except Exception as e:
-                client_name = client.__class__.__name__
-                self.logger.error(f"{client_name}: Critical error - {e}")
-                continue
-        
-        return all_articles
-    
-    def _print_summary(self, added: int, skipped: int, errors: int, total: int, 
-                      deleted: int, final_stats: Dict[str, int]) -> None:
-        """Print execution summary."""
-        print("\n" + "="*60)
-        print("EXECUTION SUMMARY")
-        print("="*60)
-        print(f"Old articles deleted: {deleted}")
-        print(f"Total articles fetched: {total}")
-        print(f"Articles added to Notion: {added}")
-        print(f"Articles skipped (duplicates/invalid): {skipped}")
-        print(f"Articles with errors: {errors}")
-        print(f"Success rate: {(added/(total or 1))*100:.1f}%")
-        print("-"*60)
-        print(f"Total articles in database: {final_stats['total_articles']}")
-        print(f"Recent articles (24h): {final_stats['recent_articles']}")
-        print(f"Retention period: {ARTICLE_RETENTION_DAYS} days")
-        print(f"Auto-delete: {'Enabled' if ENABLE_AUTO_DELETE else 'Disabled'}")
-        print("="*60)
-
-def run_cleanup_only():
-    """Run cleanup without fetching new articles."""
-    logger = setup_logging()
-    notion_manager = NotionManager(NOTION_TOKEN, DATABASE_ID, logger)
-    
-    logger.info("Running cleanup-only mode...")
-    
-    if not notion_manager.setup_database():
-        logger.error("Failed to setup database. Exiting.")
-        sys.exit(1)
-    
-    initial_stats = notion_manager.get_database_stats()
-    logger.info(f"Database contains {initial_stats['total_articles']} total articles")
-    
-    deleted_count = notion_manager.cleanup_old_articles()
-    final_stats = notion_manager.get_database_stats()
-    
-    print(f"\nCleanup completed!")
-    print(f"Articles deleted: {deleted_count}")
-    print(f"Articles remaining: {final_stats['total_articles']}")
-
-def main():
-    """Main entry point."""
-    try:
-        if len(sys.argv) > 1 and sys.argv[1] == "--cleanup-only":
-            run_cleanup_only()
-        else:
-            aggregator = NewsAggregator()
-            aggregator.run()
-    except KeyboardInterrupt:
-        print("\nProcess interrupted by user")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Critical error: {e}")
-        sys.exit(1)
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+News Aggregator Tool
+====================
+
+A news aggregation script that fetches articles from multiple APIs
+and pushes them to a Notion database with automatic cleanup.
+
+Version: 2.1.0
+Python: 3.11+
+"""
+
+import httpx
+import requests
+import ijson
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from notion_client import Client, APIResponseError, APIErrorCode
+from datetime import datetime, timezone, timedelta
+import re
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Set, Optional, Tuple, Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+import sys
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Configuration
+NOTION_TOKEN = os.getenv('NOTION_TOKEN', "ntn_v50193920684b9M32Pr8lVSz4BH97YIePN01WdXO0TS39A")
+DATABASE_ID = os.getenv('DATABASE_ID', "26612b2dd84480c9ae0cd716d42c4944")  
+GNEWS_API_KEY = os.getenv('GNEWS_API_KEY', "e6ab131a38240a286eeb29bd2704d7cc")
+MEDIASTACK_API_KEY = os.getenv('MEDIASTACK_API_KEY', "611bb902ac4ab791ac8e2e504b5586f2")
+CURRENTS_API_KEY = os.getenv('CURRENTS_API_KEY', "c4TwqKy9N7Yx6iMg-orThtFtqPSz6U6pX3ttnsVVVmf4Szg4")
+
+# Settings
+REQUEST_TIMEOUT = 30
+NOTION_MAX_WORKERS = 3
+NOTION_REQUESTS_PER_SECOND = 3
+NOTION_MAX_RETRIES = 3
+MAX_ARTICLES_PER_API = 50
+ARTICLE_RETENTION_DAYS = 3
+ENABLE_AUTO_DELETE = True
+STATS_CACHE_TTL = 300
+SCHEMA_CACHE_HOURS = 24
+CACHE_FILE = os.getenv('NEWSBOT_CACHE_FILE', ".newsbot_cache.json")
+
+# Database field names
+NOTION_PROPERTIES = {
+    'headline': 'Headline',
+    'source': 'Source',
+    'url': 'URL',
+    'category': 'Category',
+    'published_at': 'Published At',
+    'added_at': 'Added At'
+}
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "ocid", "cmpid"})
+
+# An http(s) scheme, a host and no whitespace anywhere
+_URL_RE = re.compile(r"^https?://[^\s/?#]+\S*$", re.IGNORECASE)
+
+# Allowed select options and the fallback for anything else
+_VALID_SOURCES = frozenset({"GNews", "MediaStack", "Currents", "Manual", "Unknown"})
+_VALID_CATEGORIES = frozenset({
+    "General", "Sports", "Politics", "Business", "Technology", "Entertainment", "Health"
+})
+_VALIDATORS = {
+    "source": (_VALID_SOURCES, "Unknown"),
+    "category": (_VALID_CATEGORIES, "General")
+}
+
+# Summary separators
+_SEP = "=" * 60
+_RULE = "-" * 60
+
+# API category names mapped to our categories
+_CATEGORY_MAP = {
+    "sports": "Sports",
+    "politics": "Politics",
+    "business": "Business",
+    "technology": "Technology",
+    "tech": "Technology",
+    "entertainment": "Entertainment",
+    "health": "Health"
+}
+
+def setup_logging() -> logging.Logger:
+    """Setup basic logging."""
+    logger = logging.getLogger(__name__)
+    # Configure once per process so repeated calls never stack handlers
+    if logging.getLogger().handlers:
+        return logger
+    
+    # The format never shows thread, process or caller info, so skip collecting it
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    return logger
+
+logger = setup_logging()
+
+def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 date string into an aware datetime (UTC if naive)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def preview_titles(titles: List[str], limit: int = 5) -> str:
+    """Join the first few titles for a one-line log summary."""
+    preview = ", ".join(titles[:limit])
+    return preview + ("..." if len(titles) > limit else "")
+
+def clean_text(value: Optional[str], default: str) -> str:
+    """Strip surrounding whitespace, falling back to default when empty."""
+    if not value:
+        return default
+    # API values rarely need stripping, so avoid building a new string
+    if value[0].isspace() or value[-1].isspace():
+        value = value.strip()
+    return value or default
+
+def normalize_title(title: str) -> str:
+    """Build the duplicate-detection key for a headline."""
+    return " ".join(title.casefold().split())
+
+def normalize_url(url: str) -> str:
+    """Build the duplicate-detection key for an article URL."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return ""
+    
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return ""
+    
+    query = urlencode([
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in _TRACKING_PARAMS
+    ])
+    key = host + parts.path.rstrip("/")
+    return f"{key}?{query}" if query else key
+
+@lru_cache(maxsize=64)
+def _map_category(category: str) -> str:
+    """Map a single category name; APIs only use a handful of them."""
+    # APIs already send lowercase names, so try them as-is first
+    mapped = _CATEGORY_MAP.get(category)
+    if mapped is None:
+        mapped = _CATEGORY_MAP.get(category.lower(), "General")
+    return mapped
+
+def map_category(category) -> str:
+    """Map an API category name to one of our categories."""
+    # Currents sends a list of categories, the others a single name
+    if isinstance(category, list):
+        category = category[0] if category else None
+    if not isinstance(category, str):
+        return "General"
+    return _map_category(category)
+
+@dataclass(slots=True)
+class NewsArticle:
+    """Represents a news article."""
+    title: str
+    source: str
+    url: str
+    category: str = "General"
+    published_at: Optional[str] = None
+    key: str = field(init=False, repr=False)
+    url_key: str = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        """Clean up article data."""
+        self.title = clean_text(self.title, "No Title")
+        self.source = clean_text(self.source, "Unknown")
+        self.url = clean_text(self.url, "")
+        self.category = clean_text(self.category, "General")
+        self.key = normalize_title(self.title)
+        self.url_key = normalize_url(self.url)
+        
+        if not self.published_at:
+            self.published_at = datetime.now(timezone.utc).isoformat()
+    
+    @property
+    def is_valid(self) -> bool:
+        """Check if article has required data."""
+        return bool(
+            self.title and 
+            self.title != "No Title" and
+            self.url and
+            self._is_valid_url(self.url)
+        )
+    
+    def _is_valid_url(self, url: str) -> bool:
+        """Check if URL is properly formatted."""
+        return _URL_RE.match(url) is not None
+
+def partition_articles(articles: List[NewsArticle], existing_titles: Set[str],
+                       existing_urls: Set[str]) -> Tuple[List[NewsArticle], List[NewsArticle]]:
+    """Split articles into new ones and duplicates, recording the new ones.
+    
+    Kept free of I/O and fully typed so it can be compiled with mypyc.
+    """
+    new_articles: List[NewsArticle] = []
+    duplicates: List[NewsArticle] = []
+    for article in articles:
+        # Matching on either headline or URL means we already have the story
+        if article.key in existing_titles or article.url_key in existing_urls:
+            duplicates.append(article)
+            continue
+        
+        existing_titles.add(article.key)
+        existing_urls.add(article.url_key)
+        new_articles.append(article)
+    
+    return new_articles, duplicates
+
+class NotionManager:
+    """Handles Notion database operations."""
+    
+    def __init__(self, token: str, database_id: str, logger: logging.Logger = logger):
+        # HTTP/2 lets the insert workers share one multiplexed connection
+        self.client = Client(
+            auth=token,
+            client=httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=NOTION_MAX_WORKERS)
+            )
+        )
+        self.database_id = database_id
+        self._parent = {"database_id": database_id}
+        self.logger = logger
+        self._existing_titles: Optional[Set[str]] = None
+        self._existing_urls: Set[str] = set()
+        self._cache = self._load_cache()
+        self._property_ids: Dict[str, str] = {}
+        self._stats: Optional[Dict[str, int]] = None
+        self._stats_fetched_at = 0.0
+        self._rate_lock = threading.Lock()
+        self._call_times = deque(maxlen=NOTION_REQUESTS_PER_SECOND)
+        self._paused_until = 0.0
+    
+    def setup_database(self) -> bool:
+        """Make sure database has all needed properties."""
+        try:
+            required_properties = {
+                NOTION_PROPERTIES['source']: {
+                    "select": {
+                        "options": [
+                            {"name": "GNews", "color": "blue"},
+                            {"name": "MediaStack", "color": "green"}, 
+                            {"name": "Currents", "color": "orange"},
+                            {"name": "Manual", "color": "gray"},
+                            {"name": "Unknown", "color": "default"}
+                        ]
+                    }
+                },
+                NOTION_PROPERTIES['url']: {"url": {}},
+                NOTION_PROPERTIES['category']: {
+                    "select": {
+                        "options": [
+                            {"name": "General", "color": "default"},
+                            {"name": "Sports", "color": "green"},
+                            {"name": "Politics", "color": "red"},
+                            {"name": "Business", "color": "blue"},
+                            {"name": "Technology", "color": "purple"},
+                            {"name": "Entertainment", "color": "pink"},
+                            {"name": "Health", "color": "yellow"}
+                        ]
+                    }
+                },
+                NOTION_PROPERTIES['published_at']: {"date": {}},
+                NOTION_PROPERTIES['added_at']: {"date": {}}
+            }
+            
+            # Skip the round-trip if this schema was verified recently
+            schema_hash = hashlib.sha256(orjson.dumps(
+                [self.database_id, NOTION_PROPERTIES, required_properties],
+                option=orjson.OPT_SORT_KEYS
+            )).hexdigest()
+            verified_at = parse_iso_datetime(self._cache.get("schema_verified_at"))
+            if (self._cache.get("schema_hash") == schema_hash and
+                    self._cache.get("property_ids") and verified_at and
+                    datetime.now(timezone.utc) - verified_at < timedelta(hours=SCHEMA_CACHE_HOURS)):
+                self._property_ids = self._cache["property_ids"]
+                self.logger.info("Database schema verified recently, skipping check")
+                return True
+            
+            database = self._call_notion(self.client.databases.retrieve, self.database_id)
+            current_properties = database["properties"]
+            
+            missing_properties = {}
+            for prop_name, prop_schema in required_properties.items():
+                if prop_name not in current_properties:
+                    missing_properties[prop_name] = prop_schema
+            
+            if missing_properties:
+                database = self._call_notion(
+                    self.client.databases.update,
+                    self.database_id,
+                    properties=missing_properties
+                )
+                current_properties = database["properties"]
+                self.logger.info("Added missing properties: %s", ', '.join(missing_properties.keys()))
+            else:
+                self.logger.info("All required properties exist")
+            
+            # Remember property IDs so queries can ask for only what they read
+            self._property_ids = {
+                key: current_properties[name]["id"]
+                for key, name in NOTION_PROPERTIES.items()
+                if name in current_properties
+            }
+            
+            self._cache["schema_hash"] = schema_hash
+            self._cache["schema_verified_at"] = datetime.now(timezone.utc).isoformat()
+            self._cache["property_ids"] = self._property_ids
+            self._save_cache()
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error("Failed to setup database properties: %s", e)
+            return False
+    
+    def _invalidate_schema_cache(self) -> None:
+        """Force the next setup_database call to check the schema again."""
+        if self._cache.pop("schema_hash", None) is not None:
+            self._save_cache()
+    
+    def _query_params(self, *property_keys: str) -> Dict:
+        """Build query params that only return the given properties."""
+        query_params = {"database_id": self.database_id, "page_size": 100}
+        property_ids = [
+            self._property_ids[key] for key in property_keys
+            if key in self._property_ids
+        ]
+        if property_ids:
+            query_params["filter_properties"] = property_ids
+        return query_params
+    
+    def _query_database(self, query_params: Dict, *property_keys: str) -> Dict:
+        """Run a database query, dropping cached property IDs if they look stale."""
+        try:
+            response = self._call_notion(self.client.databases.query, **query_params)
+        except Exception as e:
+            if "filter_properties" not in query_params:
+                raise
+            self._forget_property_ids()
+            # A recreated column leaves a dead ID in filter_properties
+            if not (isinstance(e, APIResponseError) and e.code == APIErrorCode.ValidationError):
+                raise
+            self.logger.warning("Filtered query rejected, retrying without property filter")
+            query_params = {k: v for k, v in query_params.items() if k != "filter_properties"}
+            response = self._call_notion(self.client.databases.query, **query_params)
+        
+        # A renamed or deleted column comes back missing from every page; fail
+        # rather than let callers treat the pages as empty
+        for page in response.get("results", []):
+            properties = page.get("properties", {})
+            if any(NOTION_PROPERTIES[key] not in properties for key in property_keys):
+                self._forget_property_ids()
+                raise ValueError("Query results are missing expected properties")
+        
+        return response
+    
+    def _forget_property_ids(self) -> None:
+        """Stop filtering by cached property IDs and re-check the schema next run."""
+        self._property_ids = {}
+        self._invalidate_schema_cache()
+    
+    def _load_cache(self) -> Dict:
+        """Load state saved by previous runs for this database."""
+        try:
+            cache = orjson.loads(Path(CACHE_FILE).read_bytes())
+        except FileNotFoundError:
+            return {"database_id": self.database_id}
+        except Exception as e:
+            self.logger.warning("Ignoring unreadable cache file: %s", e)
+            return {"database_id": self.database_id}
+        
+        if cache.get("database_id") != self.database_id:
+            self.logger.info("Cache file belongs to another database, ignoring it")
+            return {"database_id": self.database_id}
+        return cache
+    
+    def _save_cache(self) -> None:
+        """Persist state for the next run."""
+        cache_path = Path(CACHE_FILE)
+        try:
+            # Write to a temp file and swap it in so a crash never leaves half a file
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=cache_path.parent, prefix=cache_path.name, delete=False
+            ) as tmp:
+                tmp.write(orjson.dumps(self._cache))
+            os.replace(tmp.name, cache_path)
+        except Exception as e:
+            self.logger.warning("Could not write cache file: %s", e)
+    
+    def get_existing_headlines(self) -> Set[str]:
+        """Get normalized keys of all existing headlines to avoid duplicates."""
+        if self._existing_titles is not None:
+            return self._existing_titles
+        
+        # Fallback cursor for an empty result: Notion stamps pages we insert
+        # later this run with minute-rounded edit times, and clocks may drift
+        sync_started = (
+            datetime.now(timezone.utc) - timedelta(minutes=1)
+        ).replace(second=0, microsecond=0).isoformat()
+        cached_titles = self._cache.get("headlines")
+        cached_urls = self._cache.get("urls")
+        sync_cursor = self._cache.get("sync_cursor")
+        
+        # With a cache from a previous run only pages edited since then can be new
+        if cached_titles is not None and cached_urls is not None and sync_cursor:
+            existing_titles = set(cached_titles)
+            existing_urls = set(cached_urls)
+            sync_filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": sync_cursor}
+            }
+        else:
+            existing_titles = set()
+            existing_urls = set()
+            sync_filter = None
+        
+        try:
+            has_more = True
+            start_cursor = None
+            
+            while has_more:
+                query_params = self._query_params('headline', 'url')
+                if sync_filter:
+                    query_params["filter"] = sync_filter
+                if start_cursor:
+                    query_params["start_cursor"] = start_cursor
+                
+                response = self._query_database(query_params, 'headline', 'url')
+                
+                for page in response.get("results", []):
+                    # Notion rounds edit times to the minute, so keep the
+                    # newest one and query on_or_after it next time
+                    edited_at = page.get("last_edited_time")
+                    if edited_at and (not sync_cursor or edited_at > sync_cursor):
+                        sync_cursor = edited_at
+                    
+                    title_data = page.get("properties", {}).get(
+                        NOTION_PROPERTIES['headline'], {}
+                    ).get("title", [])
+                    
+                    if title_data:
+                        title = normalize_title(title_data[0]["text"]["content"])
+                        if title:
+                            existing_titles.add(title)
+                    
+                    url = page.get("properties", {}).get(
+                        NOTION_PROPERTIES['url'], {}
+                    ).get("url")
+                    if url:
+                        url_key = normalize_url(url)
+                        if url_key:
+                            existing_urls.add(url_key)
+                
+                has_more = response.get("has_more", False)
+                start_cursor = response.get("next_cursor")
+            
+            self._existing_titles = existing_titles
+            self._existing_urls = existing_urls
+            self._cache["headlines"] = sorted(existing_titles)
+            self._cache["urls"] = sorted(existing_urls)
+            self._cache["sync_cursor"] = sync_cursor or sync_started
+            self._save_cache()
+            
+            self.logger.info("Found %s existing headlines", len(existing_titles))
+            return existing_titles
+            
+        except Exception as e:
+            self.logger.error("Error fetching existing headlines: %s", e)
+            # Dedup against what the cache and the pages read so far hold, but
+            # leave the cache file alone so the next run repeats the sync
+            self._existing_titles = existing_titles
+            self._existing_urls = existing_urls
+            return existing_titles
+    
+    def cleanup_old_articles(self, retention_days: int = ARTICLE_RETENTION_DAYS) -> int:
+        """Remove articles older than specified days."""
+        if not ENABLE_AUTO_DELETE:
+            self.logger.info("Auto-delete is disabled")
+            return 0
+        
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        deleted_count = 0
+        deleted_keys = set()
+        deleted_urls = set()
+        
+        self.logger.info("Cleaning up articles older than %s days...", retention_days)
+        self.logger.info("Cutoff date: %s UTC", cutoff_date.strftime('%Y-%m-%d %H:%M:%S'))
+        
+        try:
+            filter_condition = {
+                "property": NOTION_PROPERTIES['added_at'],
+                "date": {
+                    "before": cutoff_date.isoformat()
+                }
+            }
+            
+            # Collect every expired page first; archiving while paginating
+            # would shift the cursor under the filtered query
+            pages_to_delete = []
+            has_more = True
+            start_cursor = None
+            
+            while has_more:
+                query_params = self._query_params('headline', 'url', 'added_at')
+                query_params["filter"] = filter_condition
+                if start_cursor:
+                    query_params["start_cursor"] = start_cursor
+                
+                response = self._query_database(query_params, 'headline', 'url', 'added_at')
+                
+                for page in response.get("results", []):
+                    # Get article info for logging
+                    title_data = page.get("properties", {}).get(
+                        NOTION_PROPERTIES['headline'], {}
+                    ).get("title", [])
+                    title = "Unknown Title"
+                    key = None
+                    if title_data:
+                        title = title_data[0]["text"]["content"][:50]
+                        key = normalize_title(title_data[0]["text"]["content"])
+                    
+                    added_date_data = page.get("properties", {}).get(
+                        NOTION_PROPERTIES['added_at'], {}
+                    ).get("date", {})
+                    added_date = "Unknown Date"
+                    if added_date_data and added_date_data.get("start"):
+                        added_date = added_date_data["start"][:10]
+                    
+                    url = page.get("properties", {}).get(
+                        NOTION_PROPERTIES['url'], {}
+                    ).get("url")
+                    url_key = normalize_url(url) if url else None
+                    
+                    pages_to_delete.append((page["id"], title, key, url_key, added_date))
+                
+                has_more = response.get("has_more", False)
+                start_cursor = response.get("next_cursor")
+            
+            # Archive the pages with a few requests in flight at once
+            with ThreadPoolExecutor(max_workers=NOTION_MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        self._call_notion, self.client.pages.update,
+                        page_id=page_id, archived=True
+                    ): (page_id, title, key, url_key, added_date)
+                    for page_id, title, key, url_key, added_date in pages_to_delete
+                }
+                
+                for future in as_completed(futures):
+                    page_id, title, key, url_key, added_date = futures[future]
+                    try:
+                        future.result()
+                        deleted_count += 1
+                        if key:
+                            deleted_keys.add(key)
+                        if url_key:
+                            deleted_urls.add(url_key)
+                        self.logger.debug("Deleted: '%s' (added: %s)", title, added_date)
+                    except Exception as e:
+                        self.logger.error("Error deleting page %s: %s", page_id, e)
+            
+            self.logger.info("Cleanup completed. Deleted %s old articles", deleted_count)
+            return deleted_count
+            
+        except Exception as e:
+            self.logger.error("Error during cleanup: %s", e)
+            return deleted_count
+        
+        finally:
+            self._adjust_stats(-deleted_count)
+            self._forget_headlines(deleted_keys, deleted_urls)
+    
+    def _forget_headlines(self, keys: Set[str], url_keys: Set[str]) -> None:
+        """Drop archived headlines from the in-memory and on-disk caches."""
+        if not keys and not url_keys:
+            return
+        
+        if self._existing_titles is not None:
+            self._existing_titles -= keys
+        self._existing_urls -= url_keys
+        
+        cached_titles = self._cache.get("headlines")
+        cached_urls = self._cache.get("urls")
+        if cached_titles is not None:
+            self._cache["headlines"] = [t for t in cached_titles if t not in keys]
+        if cached_urls is not None:
+            self._cache["urls"] = [u for u in cached_urls if u not in url_keys]
+        self._save_cache()
+    
+    def _remember_headlines(self, keys: Set[str], url_keys: Set[str]) -> None:
+        """Add inserted headlines to the on-disk cache."""
+        cached_titles = self._cache.get("headlines")
+        cached_urls = self._cache.get("urls")
+        # Only extend an index a completed sync wrote; a partial one is rebuilt next run
+        if cached_titles is None or cached_urls is None:
+            return
+        
+        self._cache["headlines"] = sorted(keys.union(cached_titles))
+        self._cache["urls"] = sorted(url_keys.union(cached_urls))
+        self._save_cache()
+    
+    def get_database_stats(self) -> Dict[str, int]:
+        """Get database statistics."""
+        if (self._stats is not None and
+                time.monotonic() - self._stats_fetched_at < STATS_CACHE_TTL):
+            return dict(self._stats)
+        
+        try:
+            total_articles = recent_articles = 0
+            yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+            has_more = True
+            start_cursor = None
+            
+            # Count total and recent articles in a single pass
+            while has_more:
+                query_params = self._query_params('added_at')
+                if start_cursor:
+                    query_params["start_cursor"] = start_cursor
+                
+                response = self._query_database(query_params, 'added_at')
+                
+                for page in response.get("results", []):
+                    total_articles += 1
+                    
+                    added_date_data = page.get("properties", {}).get(
+                        NOTION_PROPERTIES['added_at'], {}
+                    ).get("date") or {}
+                    added_at = parse_iso_datetime(added_date_data.get("start"))
+                    if added_at and added_at > yesterday:
+                        recent_articles += 1
+                
+                has_more = response.get("has_more", False)
+                start_cursor = response.get("next_cursor")
+            
+            self._stats = {
+                "total_articles": total_articles,
+                "recent_articles": recent_articles
+            }
+            self._stats_fetched_at = time.monotonic()
+            return dict(self._stats)
+            
+        except Exception as e:
+            self.logger.error("Error getting database stats: %s", e)
+            return {"total_articles": 0, "recent_articles": 0}
+    
+    def _adjust_stats(self, total_delta: int, recent_delta: int = 0) -> None:
+        """Keep cached stats in step with our own writes."""
+        if self._stats is not None:
+            self._stats["total_articles"] += total_delta
+            self._stats["recent_articles"] += recent_delta
+    
+    def add_articles(self, articles: List[NewsArticle]) -> Tuple[int, int, int]:
+        """Add articles to database, skipping invalid ones and duplicates."""
+        if not articles:
+            self.logger.warning("No articles to add")
+            return 0, 0, 0
+        
+        # The aggregator validates at fetch time; other callers may not have
+        valid_articles = [article for article in articles if article.is_valid]
+        invalid_count = len(articles) - len(valid_articles)
+        if invalid_count:
+            self.logger.warning("Skipped %s invalid articles", invalid_count)
+        
+        added, skipped, errors = self.add_articles_iter([valid_articles])
+        return added, skipped + invalid_count, errors
+    
+    def add_articles_iter(self, batches: Iterable[List[NewsArticle]]) -> Tuple[int, int, int]:
+        """Add batches of already validated articles to database as they arrive."""
+        existing_headlines = None
+        existing_urls = None
+        added_count = skipped_count = error_count = 0
+        added_titles = []
+        added_keys = set()
+        added_url_keys = set()
+        futures = {}
+        
+        # One timestamp for the run; inserts finish within seconds
+        added_at = datetime.now(timezone.utc).isoformat()
+        
+        # Each batch is scheduled as soon as it arrives, so inserts for the
+        # first API overlap with the fetches still running for the others
+        with ThreadPoolExecutor(max_workers=NOTION_MAX_WORKERS) as executor:
+            for batch in batches:
+                if not batch:
+                    continue
+                
+                # Loaded on the first real batch so a run where every API
+                # failed never scans the database
+                if existing_headlines is None:
+                    existing_headlines = self.get_existing_headlines()
+                    existing_urls = self._existing_urls
+                
+                # Filter before scheduling so the pool only handles network work
+                to_add, duplicates = partition_articles(batch, existing_headlines, existing_urls)
+                skipped_count += len(duplicates)
+                
+                if duplicates and self.logger.isEnabledFor(logging.DEBUG):
+                    for article in duplicates:
+                        self.logger.debug("Skipped duplicate: %s", article.title)
+                
+                for article in to_add:
+                    futures[executor.submit(self._create_page, article, added_at)] = article
+            
+            if skipped_count:
+                self.logger.info("Skipped %s duplicate articles", skipped_count)
+            
+            for future in as_completed(futures):
+                article = futures[future]
+                try:
+                    future.result()
+                    self.logger.debug("Added: %s", article.title)
+                    added_titles.append(article.title)
+                    added_keys.add(article.key)
+                    added_url_keys.add(article.url_key)
+                    added_count += 1
+                except Exception as e:
+                    self.logger.error("Error adding article '%s': %s", article.title, e)
+                    existing_headlines.discard(article.key)
+                    existing_urls.discard(article.url_key)
+                    error_count += 1
+        
+        if added_titles:
+            self.logger.info("Added %s articles: %s", added_count, preview_titles(added_titles))
+            # Record our own inserts so the next run does not depend on the sync cursor alone
+            self._remember_headlines(added_keys, added_url_keys)
+        
+        # A failed insert may mean the schema drifted since it was verified
+        if error_count:
+            self._invalidate_schema_cache()
+        
+        self._adjust_stats(added_count, added_count)
+        return added_count, skipped_count, error_count
+    
+    def _wait_for_rate_limit(self) -> None:
+        """Block until a request fits in Notion's per-second budget."""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if len(self._call_times) == self._call_times.maxlen:
+                wait = max(wait, self._call_times[0] + 1.0 - now)
+            # Reserve the slot so concurrent callers queue up behind it
+            self._call_times.append(now + wait)
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _call_notion(self, func, *args, **kwargs):
+        """Call a Notion endpoint, pacing requests and retrying when rate limited."""
+        for attempt in range(NOTION_MAX_RETRIES + 1):
+            self._wait_for_rate_limit()
+            try:
+                return func(*args, **kwargs)
+            except APIResponseError as e:
+                if e.code != APIErrorCode.RateLimited or attempt == NOTION_MAX_RETRIES:
+                    raise
+                try:
+                    retry_after = float(e.headers.get("Retry-After", 1))
+                except ValueError:
+                    retry_after = 1.0
+                self.logger.warning("Notion rate limit hit, retrying in %gs", retry_after)
+                # Hold back every worker, not just this one, until Notion is ready
+                with self._rate_lock:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+    
+    def _create_page(self, article: NewsArticle, added_at: str) -> None:
+        """Create new page in database."""
+        safe_source = self._validate_option(article.source, "source")
+        safe_category = self._validate_option(article.category, "category")
+        
+        props = NOTION_PROPERTIES
+        properties = {
+            props['headline']: {
+                "title": [{"text": {"content": article.title}}]
+            },
+            props['source']: {
+                "select": {"name": safe_source}
+            },
+            props['url']: {
+                "url": article.url
+            },
+            props['category']: {
+                "select": {"name": safe_category}
+            },
+            props['published_at']: {
+                "date": {"start": article.published_at}
+            },
+            props['added_at']: {
+                "date": {"start": added_at}
+            }
+        }
+        
+        self._call_notion(
+            self.client.pages.create,
+            parent=self._parent,
+            properties=properties
+        )
+    
+    def _validate_option(self, value: str, field_type: str) -> str:
+        """Make sure option exists in select field."""
+        if field_type not in _VALIDATORS:
+            return value
+        
+        valid, default = _VALIDATORS[field_type]
+        return value if value in valid else default
+
+def create_http_session() -> requests.Session:
+    """Create an HTTP session with pooling and retries for the news APIs."""
+    session = requests.Session()
+    # Accept-Encoding keeps the requests default, which offers br
+    # only when a brotli decoder is installed
+    session.headers.update({
+        "User-Agent": "newsbot/2.1.0",
+        "Accept": "application/json"
+    })
+    
+    # Back off and retry on rate limits and transient server errors
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504)
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# One session shared by every API client so connections are reused
+_SESSION = create_http_session()
+
+@dataclass(frozen=True)
+class APIConfig:
+    """Describes a news API: its URL and where articles live in the response."""
+    name: str
+    url_template: str
+    items_prefix: str
+    published_key: str
+
+GNEWS_API = APIConfig(
+    name="GNews",
+    url_template=("https://gnews.io/api/v4/top-headlines?"
+                  "country=ng&lang=en&token={api_key}&max={limit}"),
+    items_prefix="articles.item",
+    published_key="publishedAt"
+)
+MEDIASTACK_API = APIConfig(
+    name="MediaStack",
+    url_template=("http://api.mediastack.com/v1/news?"
+                  "access_key={api_key}&countries=ng&languages=en&limit={limit}"),
+    items_prefix="data.item",
+    published_key="published_at"
+)
+CURRENTS_API = APIConfig(
+    name="Currents",
+    url_template=("https://api.currentsapi.services/v1/latest-news?"
+                  "apiKey={api_key}&language=en&region=ng"),
+    items_prefix="news.item",
+    published_key="published"
+)
+
+class NewsAPIClient:
+    """Fetches articles from the news API described by an APIConfig."""
+    
+    def __init__(self, config: APIConfig, api_key: str, logger: logging.Logger = logger,
+                 session: Optional[requests.Session] = None):
+        self.config = config
+        self.api_key = api_key
+        self.logger = logger
+        self.session = session or _SESSION
+        # Key and limit are fixed for the process, so the URL is too
+        self._url = config.url_template.format(api_key=api_key, limit=MAX_ARTICLES_PER_API)
+    
+    def fetch_articles(self) -> Tuple[List[NewsArticle], int]:
+        """Get articles from this API and the number of invalid ones dropped."""
+        api_name = self.config.name
+        
+        self.logger.info("Fetching from %s...", api_name)
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        
+        articles = []
+        invalid_count = 0
+        for item in self._iter_items(self._url, self.config.items_prefix, api_name):
+            try:
+                # Dates come in several ISO-ish formats; Notion wants strict ISO 8601
+                published = parse_iso_datetime(item.get(self.config.published_key))
+                
+                article = NewsArticle(
+                    title=item.get("title", "No Title"),
+                    source=api_name,
+                    url=item.get("url", ""),
+                    category=map_category(item.get("category")),
+                    published_at=published.isoformat() if published else fetched_at
+                )
+                if not article.is_valid:
+                    self.logger.warning("%s: Skipped invalid article: %s", api_name, article.title)
+                    invalid_count += 1
+                    continue
+                articles.append(article)
+            except Exception as e:
+                self.logger.warning("%s: Error parsing article - %s", api_name, e)
+                continue
+        
+        if not articles:
+            self.logger.warning("%s: No articles in response", api_name)
+            return [], invalid_count
+        
+        self.logger.info("%s: Fetched %s articles", api_name, len(articles))
+        return articles, invalid_count
+    
+    def _iter_items(self, url: str, prefix: str, api_name: str) -> Iterator[Dict]:
+        """Request url and yield the items under prefix as they are parsed off the wire."""
+        try:
+            with self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                # Let urllib3 undo gzip/deflate before the parser sees the bytes
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, prefix)
+        except requests.exceptions.Timeout:
+            self.logger.error("%s: Request timeout", api_name)
+        except requests.exceptions.RequestException as e:
+            self.logger.error("%s: Network error - %s", api_name, e)
+        except Exception as e:
+            self.logger.error("%s: Unexpected error - %s", api_name, e)
+
+@dataclass(slots=True)
+class FetchStats:
+    """Counts gathered while articles stream from the APIs to Notion."""
+    fetched: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+
+class NewsAggregator:
+    """Main news aggregation handler."""
+    
+    def __init__(self, logger: logging.Logger = logger):
+        self.logger = logger
+        self.notion_manager = NotionManager(NOTION_TOKEN, DATABASE_ID, self.logger)
+        
+        self.api_clients = [
+            NewsAPIClient(GNEWS_API, GNEWS_API_KEY, self.logger),
+            NewsAPIClient(MEDIASTACK_API, MEDIASTACK_API_KEY, self.logger),
+            NewsAPIClient(CURRENTS_API, CURRENTS_API_KEY, self.logger)
+        ]
+    
+    def run(self) -> None:
+        """Run the news aggregation process."""
+        self.logger.info("Starting news aggregator...")
+        
+        # Setup database
+        if not self.notion_manager.setup_database():
+            self.logger.error("Failed to setup database. Exiting.")
+            sys.exit(1)
+        
+        # Get initial stats
+        initial_stats = self.notion_manager.get_database_stats()
+        self.logger.info("Database contains %s total articles", initial_stats['total_articles'])
+        
+        # Clean up old articles
+        deleted_count = self.notion_manager.cleanup_old_articles()
+        
+        # Fetch new articles and add them to database as each API returns
+        fetch_stats = FetchStats()
+        batches = self._normalize_and_dedup(self._fetch_articles(fetch_stats), fetch_stats)
+        added, skipped, errors = self.notion_manager.add_articles_iter(batches)
+        
+        if not fetch_stats.fetched:
+            self.logger.warning("No articles were fetched from any API")
+            return
+        
+        self.logger.info("Total articles fetched: %s", fetch_stats.fetched)
+        skipped += fetch_stats.invalid + fetch_stats.duplicates
+        
+        # Get final stats
+        final_stats = self.notion_manager.get_database_stats()
+        
+        # Show summary
+        self._print_summary(added, skipped, errors, fetch_stats.fetched, deleted_count, final_stats)
+        self.logger.info("News aggregation completed!")
+    
+    def _fetch_articles(self, stats: FetchStats) -> Iterator[List[NewsArticle]]:
+        """Start fetching from all APIs and return their results as they complete."""
+        # Each fetch is a single blocking HTTP round-trip, so threads overlap
+        # the waits. Submitting here rather than inside the generator starts
+        # every fetch at once instead of on the first pull.
+        executor = ThreadPoolExecutor(max_workers=len(self.api_clients))
+        futures = {
+            executor.submit(client.fetch_articles): client
+            for client in self.api_clients
+        }
+        return self._iter_fetch_results(executor, futures, stats)
+    
+    def _iter_fetch_results(self, executor: ThreadPoolExecutor,
+                            futures: Dict[Future, "NewsAPIClient"],
+                            stats: FetchStats) -> Iterator[List[NewsArticle]]:
+        """Yield each API's articles in completion order."""
+        try:
+            for future in as_completed(futures):
+                try:
+                    articles, invalid_count = future.result()
+                except Exception as e:
+                    api_name = futures[future].config.name
+                    self.logger.error("%s: Critical error - %s", api_name, e)
+                    continue
+                
+                stats.fetched += len(articles) + invalid_count
+                stats.invalid += invalid_count
+                yield articles
+        finally:
+            executor.shutdown(wait=True)
+    
+    def _normalize_and_dedup(self, batches: Iterable[List[NewsArticle]],
+                             stats: FetchStats) -> Iterator[List[NewsArticle]]:
+        """Drop the same story reported by more than one API."""
+        seen_titles = set()
+        seen_urls = set()
+        duplicates = 0
+        for articles in batches:
+            unique_articles = []
+            for article in articles:
+                if article.key in seen_titles or article.url_key in seen_urls:
+                    continue
+                seen_titles.add(article.key)
+                seen_urls.add(article.url_key)
+                unique_articles.append(article)
+            
+            duplicates += len(articles) - len(unique_articles)
+            yield unique_articles
+        
+        stats.duplicates += duplicates
+        if duplicates:
+            self.logger.info("Dropped %s duplicate articles across APIs", duplicates)
+    
+    def _print_summary(self, added: int, skipped: int, errors: int, total: int, 
+                      deleted: int, final_stats: Dict[str, int]) -> None:
+        """Print execution summary."""
+        print("\n" + _SEP)
+        print("EXECUTION SUMMARY")
+        print(_SEP)
+        print(f"Old articles deleted: {deleted}")
+        print(f"Total articles fetched: {total}")
+        print(f"Articles added to Notion: {added}")
+        print(f"Articles skipped (duplicates/invalid): {skipped}")
+        print(f"Articles with errors: {errors}")
+        success_rate = added * 100.0 / max(total, 1)
+        print(f"Success rate: {success_rate:.1f}%")
+        print(_RULE)
+        print(f"Total articles in database: {final_stats['total_articles']}")
+        print(f"Recent articles (24h): {final_stats['recent_articles']}")
+        print(f"Retention period: {ARTICLE_RETENTION_DAYS} days")
+        print(f"Auto-delete: {'Enabled' if ENABLE_AUTO_DELETE else 'Disabled'}")
+        print(_SEP)
+
+def run_cleanup_only():
+    """Run cleanup without fetching new articles."""
+    notion_manager = NotionManager(NOTION_TOKEN, DATABASE_ID, logger)
+    
+    logger.info("Running cleanup-only mode...")
+    
+    if not notion_manager.setup_database():
+        logger.error("Failed to setup database. Exiting.")
+        sys.exit(1)
+    
+    initial_stats = notion_manager.get_database_stats()
+    logger.info("Database contains %s total articles", initial_stats['total_articles'])
+    
+    deleted_count = notion_manager.cleanup_old_articles()
+    final_stats = notion_manager.get_database_stats()
+    
+    print(f"\nCleanup completed!")
+    print(f"Articles deleted: {deleted_count}")
+    print(f"Articles remaining: {final_stats['total_articles']}")
+
+def main():
+    """Main entry point."""
+    try:
+        if len(sys.argv) > 1 and sys.argv[1] == "--cleanup-only":
+            run_cleanup_only()
+        else:
+            aggregator = NewsAggregator()
+            aggregator.run()
+    except KeyboardInterrupt:
+        print("\nProcess interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Critical error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()